@@ -44,9 +44,6 @@ from diffpy.structure.pdffitstructure import PDFFitStructure
 from diffpy.structure.structure import Structure
 from diffpy.structure.structureerrors import LatticeError, StructureFormatError, SymmetryError
 
-# package version
-from diffpy.structure.version import __version__
-
 # top level routines
 
 
@@ -87,7 +84,19 @@ assert Lattice
 assert Structure
 assert PDFFitStructure
 
-# silence the pyflakes syntax checker
-assert __version__ or True
+
+def __getattr__(name):
+    """Load the package version only when it is requested."""
+    if name == "__version__":
+        from diffpy.structure.version import __version__
+
+        return __version__
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    """Include the lazily loaded package version in the listing."""
+    return sorted(set(globals()) | {"__version__"})
+
 
 # End of file
@@ -222,12 +222,13 @@ class Atom(object):
             The copy of this object.
         """
         if target is None:
-            target = Atom()
+            # skip __init__ as all its data members are replaced below
+            target = Atom.__new__(Atom)
         elif target is self:
             return target
         target.__dict__.update(self.__dict__)
-        target.xyz = numpy.copy(self.xyz)
-        target._U = numpy.copy(self._U)
+        target.xyz = numpy.array(self.xyz, dtype=float)
+        target._U = numpy.array(self._U, dtype=float)
         return target
 
     # property handlers ------------------------------------------------------
@@ -82,25 +82,14 @@ def makeEllipsoid(S, a, b=None, c=None):
     # Find the central atom
     ncenter = findCenter(newS)
 
-    cxyz = lat.cartesian(newS[ncenter].xyz)
-
-    delList = []
-    N = len(newS)
-    j = N
-    for i in range(N):
-        j -= 1
-
-        # Calculate (x/a)**2 + (y/b)**2 + (z/c)**2
-        xyz = lat.cartesian(newS[j].xyz)
-        darray = ((xyz - cxyz) / sabc) ** 2
-        d = sum(darray) ** 0.5
-
-        # Discard atom if (x/a)**2 + (y/b)**2 + (z/c)**2 > 1
-        if d > 1:
-            delList.append(j)
-
-    for i in delList:
-        newS.pop(i)
+    # Calculate (x/a)**2 + (y/b)**2 + (z/c)**2 for all atoms at once
+    xyz = lat.cartesian(newS.xyz)
+    darray = ((xyz - xyz[ncenter]) / sabc) ** 2
+    d = darray.sum(axis=1) ** 0.5
+
+    # Discard atoms with (x/a)**2 + (y/b)**2 + (z/c)**2 > 1
+    keepatoms = [atom for atom, dj in zip(newS, d) if not dj > 1]
+    newS.__setitem__(slice(None), keepatoms, copy=False)
 
     return newS
 
@@ -18,7 +18,7 @@
 
 import numpy
 
-from diffpy.structure import Atom, Structure
+from diffpy.structure import Structure
 
 
 def supercell(S, mno):
@@ -70,15 +70,21 @@ def supercell(S, mno):
 
     # back to business
     ijklist = [(i, j, k) for i in range(mno[0]) for j in range(mno[1]) for k in range(mno[2])]
+    ijkarray = numpy.array(ijklist, dtype=float)
     # numpy.floor returns float array
     mnofloats = numpy.array(mno, dtype=float)
 
-    # build a list of new atoms
+    # fractional coordinates of all images as (atoms, images, 3) array
+    xyzall = (S.xyz.reshape(-1, 1, 3) + ijkarray) / mnofloats
+    # build a list of new atoms, reuse the copies in newS for the
+    # images in the original cell, which come first in ijklist
     newAtoms = []
-    for a in S:
-        for ijk in ijklist:
-            adup = Atom(a)
-            adup.xyz = (a.xyz + ijk) / mnofloats
+    for a, a0, xyzimages in zip(S, newS, xyzall):
+        a0.xyz[:] = xyzimages[0]
+        newAtoms.append(a0)
+        for xyz in xyzimages[1:]:
+            adup = a.__copy__()
+            adup.xyz[:] = xyz
             newAtoms.append(adup)
     # newS can own references in newAtoms, no need to make copies
     newS.__setitem__(slice(None), newAtoms, copy=False)
@@ -25,14 +25,21 @@ cartesian : Lattice
 import math
 
 import numpy
-import numpy.linalg as numalg
 
 from diffpy.structure.structureerrors import LatticeError
 
 # Helper Functions -----------------------------------------------------------
 
-# exact values of cosd
+# unit matrix used for checking unrotated lattice bases
+_identity3 = numpy.identity(3)
+_identity3.setflags(write=False)
+
+# cell parameters of the Cartesian coordinate system
+_cartesian_abcABG = (1.0, 1.0, 1.0, 90.0, 90.0, 90.0)
+
+# exact values of cosd and sind
 _EXACT_COSD = {0.0: +1.0, 60.0: +0.5, 90.0: 0.0, 120.0: -0.5, 180.0: -1.0, 240.0: -0.5, 270.0: 0.0, 300.0: +0.5}
+_EXACT_SIND = {(90.0 - x) % 360.0: v for x, v in _EXACT_COSD.items()}
 
 
 def cosd(x):
@@ -71,7 +78,37 @@ def sind(x):
     float
         The sine of the angle *x*.
     """
-    return cosd(90.0 - x)
+    rv = _EXACT_SIND.get(x % 360.0)
+    if rv is None:
+        rv = math.sin(math.radians(x))
+    return rv
+
+
+def _cosdsind(x):
+    """Return the cosine and sine of *x* (measured in degrees).
+
+    This gives the same values as `cosd` and `sind`, but with a single
+    lookup in the table of exact values.
+
+    Parameters
+    ----------
+    x : float
+        The angle in degrees.
+
+    Returns
+    -------
+    (float, float)
+        The cosine and sine of the angle *x*.
+    """
+    c, s = _EXACT_COSD_SIND.get(x % 360.0, (None, None))
+    if c is None:
+        c = math.cos(math.radians(x))
+    if s is None:
+        s = math.sin(math.radians(x))
+    return (c, s)
+
+
+_EXACT_COSD_SIND = {x: (_EXACT_COSD.get(x), _EXACT_SIND.get(x)) for x in set(_EXACT_COSD).union(_EXACT_SIND)}
 
 
 # ----------------------------------------------------------------------------
@@ -156,6 +193,11 @@ class Lattice(object):
     # round-off tolerance
     _epsilon = 1.0e-8
 
+    # cached values of lazily evaluated tensors, None when not evaluated
+    _normbase = None
+    _recnormbase = None
+    _isotropicunit = None
+
     # properties -------------------------------------------------------------
 
     a = property(
@@ -203,6 +245,52 @@ class Lattice(object):
 
     volume = property(lambda self: self.a * self.b * self.c * self.unitvolume, doc="The unit cell volume.")
 
+    @property
+    def normbase(self):
+        """The `base` vectors scaled by magnitudes of reciprocal cell lengths.
+
+        This is evaluated on first use and cached until the next update of
+        the lattice parameters.
+        """
+        if self._normbase is None:
+            self._normbase = self.base * numpy.array([[self._ar], [self._br], [self._cr]])
+        return self._normbase
+
+    @normbase.setter
+    def normbase(self, value):
+        self._normbase = value
+
+    @property
+    def recnormbase(self):
+        """The inverse of the `normbase` matrix.
+
+        This is evaluated on first use and cached until the next update of
+        the lattice parameters.
+        """
+        if self._recnormbase is None:
+            self._recnormbase = self.recbase / numpy.array([self._ar, self._br, self._cr])
+        return self._recnormbase
+
+    @recnormbase.setter
+    def recnormbase(self, value):
+        self._recnormbase = value
+
+    @property
+    def isotropicunit(self):
+        """The 3x3 tensor for a unit isotropic displacement parameters.
+
+        This is an identity matrix when this Lattice is orthonormal.
+        The tensor is evaluated on first use and cached until the next update of
+        the lattice parameters.
+        """
+        if self._isotropicunit is None:
+            self._isotropicunit = _isotropicunit(self.recnormbase)
+        return self._isotropicunit
+
+    @isotropicunit.setter
+    def isotropicunit(self, value):
+        self._isotropicunit = value
+
     ar = property(lambda self: self._ar, doc="The cell length *a* of the reciprocal lattice.")
 
     br = property(lambda self: self._br, doc="The cell length *b* of the reciprocal lattice.")
@@ -265,7 +353,7 @@ class Lattice(object):
         self._sar = self._sbr = self._sgr = None
         self.baserot = numpy.identity(3)
         self.base = self.recbase = None
-        self.normbase = self.recnormbase = None
+        self._normbase = self._recnormbase = self._isotropicunit = None
         # work out argument variants
         # Lattice()
         if not argset:
@@ -279,7 +367,10 @@ class Lattice(object):
         elif isinstance(a, Lattice):
             if len(argset) > 1:
                 raise ValueError("Lattice object must be the only argument.")
-            self.__dict__.update(a.__dict__)
+            # copy array attributes so the duplicate does not share them
+            self.__dict__.update(
+                (k, v.copy() if isinstance(v, numpy.ndarray) else v) for k, v in a.__dict__.items()
+            )
         # otherwise do default Lattice(a, b, c, alpha, beta, gamma)
         else:
             abcabg = ("a", "b", "c", "alpha", "beta", "gamma")
@@ -330,48 +421,10 @@ class Lattice(object):
             self._gamma = float(gamma)
         if baserot is not None:
             self.baserot = numpy.array(baserot)
-        self._ca = ca = cosd(self.alpha)
-        self._cb = cb = cosd(self.beta)
-        self._cg = cg = cosd(self.gamma)
-        self._sa = sa = sind(self.alpha)
-        self._sb = sb = sind(self.beta)
-        self._sg = sg = sind(self.gamma)
-        # cache the unit volume value
-        Vunit = self.unitvolume
-        # reciprocal lattice
-        self._ar = ar = sa / (self.a * Vunit)
-        self._br = br = sb / (self.b * Vunit)
-        self._cr = cr = sg / (self.c * Vunit)
-        self._car = car = (cb * cg - ca) / (sb * sg)
-        self._cbr = cbr = (ca * cg - cb) / (sa * sg)
-        self._cgr = cgr = (ca * cb - cg) / (sa * sb)
-        self._sar = math.sqrt(1.0 - car * car)
-        self._sbr = math.sqrt(1.0 - cbr * cbr)
-        self._sgr = sgr = math.sqrt(1.0 - cgr * cgr)
-        self._alphar = math.degrees(math.acos(car))
-        self._betar = math.degrees(math.acos(cbr))
-        self._gammar = math.degrees(math.acos(cgr))
-        # metrics tensor
-        self.metrics = numpy.array(
-            [
-                [self.a * self.a, self.a * self.b * cg, self.a * self.c * cb],
-                [self.b * self.a * cg, self.b * self.b, self.b * self.c * ca],
-                [self.c * self.a * cb, self.c * self.b * ca, self.c * self.c],
-            ],
-            dtype=float,
-        )
-        # standard Cartesian coordinates of lattice vectors
-        self.stdbase = numpy.array(
-            [[1.0 / ar, -cgr / sgr / ar, cb * self.a], [0.0, self.b * sa, self.b * ca], [0.0, 0.0, self.c]],
-            dtype=float,
-        )
-        # Cartesian coordinates of lattice vectors
-        self.base = numpy.dot(self.stdbase, self.baserot)
-        self.recbase = numalg.inv(self.base)
-        # bases normalized to unit reciprocal vectors
-        self.normbase = self.base * [[ar], [br], [cr]]
-        self.recnormbase = self.recbase / [ar, br, cr]
-        self.isotropicunit = _isotropicunit(self.recnormbase)
+        self._ca, self._sa = _cosdsind(self.alpha)
+        self._cb, self._sb = _cosdsind(self.beta)
+        self._cg, self._sg = _cosdsind(self.gamma)
+        self._updateDerived()
         return
 
     def setLatBase(self, base):
@@ -387,57 +440,123 @@ class Lattice(object):
             The 3x3 matrix of row base vectors expressed
             in Cartesian coordinates.
         """
-        self.base = numpy.array(base)
-        detbase = numalg.det(self.base)
+        self.base = numpy.array(base, dtype=float)
+        adjbase, detbase = _adjugate3(self.base)
         if abs(detbase) < 1.0e-8:
             emsg = "base vectors are degenerate"
             raise LatticeError(emsg)
         elif detbase < 0.0:
             emsg = "base is not right-handed"
             raise LatticeError(emsg)
-        self._a = a = math.sqrt(numpy.dot(self.base[0, :], self.base[0, :]))
-        self._b = b = math.sqrt(numpy.dot(self.base[1, :], self.base[1, :]))
-        self._c = c = math.sqrt(numpy.dot(self.base[2, :], self.base[2, :]))
-        self._ca = ca = numpy.dot(self.base[1, :], self.base[2, :]) / (b * c)
-        self._cb = cb = numpy.dot(self.base[0, :], self.base[2, :]) / (a * c)
-        self._cg = cg = numpy.dot(self.base[0, :], self.base[1, :]) / (a * b)
-        self._sa = sa = math.sqrt(1.0 - ca**2)
-        self._sb = sb = math.sqrt(1.0 - cb**2)
-        self._sg = sg = math.sqrt(1.0 - cg**2)
+        # obtain all dot products of the base vectors in a single call
+        (g00, g01, g02), (_, g11, g12), (_, _, g22) = numpy.dot(self.base, self.base.T).tolist()
+        self._a = a = math.sqrt(g00)
+        self._b = b = math.sqrt(g11)
+        self._c = c = math.sqrt(g22)
+        self._ca = ca = g12 / (b * c)
+        self._cb = cb = g02 / (a * c)
+        self._cg = cg = g01 / (a * b)
+        self._sa = math.sqrt(1.0 - ca**2)
+        self._sb = math.sqrt(1.0 - cb**2)
+        self._sg = math.sqrt(1.0 - cg**2)
         self._alpha = math.degrees(math.acos(ca))
         self._beta = math.degrees(math.acos(cb))
         self._gamma = math.degrees(math.acos(cg))
-        # cache the unit volume value
-        Vunit = self.unitvolume
+        self.recbase = adjbase / detbase
+        self._updateDerived(have_base=True)
+        return
+
+    def _updateDerived(self, have_base=False):
+        """Update all attributes derived from the cell parameters.
+
+        This is the shared code path of `setLatPar` and `setLatBase`.
+        It assumes the cell lengths and angles with their cosines and
+        sines are already up to date.
+
+        Parameters
+        ----------
+        have_base : bool, Optional
+            Flag for `base` and `recbase` being already set, in which
+            case the `baserot` matrix is calculated from the `base`.
+            Otherwise `base` and `recbase` are obtained from `baserot`.
+        """
         # reciprocal lattice
-        self._ar = ar = sa / (self.a * Vunit)
-        self._br = br = sb / (self.b * Vunit)
-        self._cr = cr = sg / (self.c * Vunit)
+        self._updateReciprocal()
+        # metrics tensor
+        self._updateMetrics()
+        # standard Cartesian coordinates of lattice vectors
+        self._updateStdbase()
+        if have_base:
+            # calculate unit cell rotation matrix, base = stdbase @ baserot
+            self.baserot = numpy.dot(_invUpperTriangular3(self.stdbase), self.base)
+        # Cartesian coordinates of lattice vectors, skip the product
+        # with the rotation matrix in the common unrotated case.
+        # baserot is a public attribute, check it on every call.
+        elif numpy.array_equal(self.baserot, _identity3):
+            self.base = self.stdbase.copy()
+            self.recbase = _invUpperTriangular3(self.stdbase)
+        else:
+            self.base = numpy.dot(self.stdbase, self.baserot)
+            adjbase, detbase = _adjugate3(self.base)
+            self.recbase = adjbase / detbase
+        # reset bases normalized to unit reciprocal vectors, they are
+        # evaluated when used.
+        self._normbase = self._recnormbase = self._isotropicunit = None
+        return
+
+    def _updateReciprocal(self):
+        """Update the reciprocal cell parameters.
+
+        This assumes the cell lengths and cosines and sines of the cell
+        angles are already up to date.
+        """
+        a, b, c = self._a, self._b, self._c
+        ca, cb, cg = self._ca, self._cb, self._cg
+        sa, sb, sg = self._sa, self._sb, self._sg
+        # unit volume from the cached cosines
+        Vunit = math.sqrt(1.0 + 2.0 * ca * cb * cg - ca * ca - cb * cb - cg * cg)
+        self._ar = sa / (a * Vunit)
+        self._br = sb / (b * Vunit)
+        self._cr = sg / (c * Vunit)
         self._car = car = (cb * cg - ca) / (sb * sg)
         self._cbr = cbr = (ca * cg - cb) / (sa * sg)
         self._cgr = cgr = (ca * cb - cg) / (sa * sb)
-        self._sar = math.sqrt(1.0 - car**2)
-        self._sbr = math.sqrt(1.0 - cbr**2)
-        self._sgr = sgr = math.sqrt(1.0 - cgr**2)
+        self._sar = math.sqrt(1.0 - car * car)
+        self._sbr = math.sqrt(1.0 - cbr * cbr)
+        self._sgr = math.sqrt(1.0 - cgr * cgr)
         self._alphar = math.degrees(math.acos(car))
         self._betar = math.degrees(math.acos(cbr))
         self._gammar = math.degrees(math.acos(cgr))
-        # standard orientation of lattice vectors
-        self.stdbase = numpy.array(
-            [[1.0 / ar, -cgr / sgr / ar, cb * a], [0.0, b * sa, b * ca], [0.0, 0.0, c]], dtype=float
-        )
-        # calculate unit cell rotation matrix, base = stdbase @ baserot
-        self.baserot = numpy.dot(numalg.inv(self.stdbase), self.base)
-        self.recbase = numalg.inv(self.base)
-        # bases normalized to unit reciprocal vectors
-        self.normbase = self.base * [[ar], [br], [cr]]
-        self.recnormbase = self.recbase / [ar, br, cr]
-        self.isotropicunit = _isotropicunit(self.recnormbase)
-        # update metrics tensor
-        self.metrics = numpy.array(
-            [[a * a, a * b * cg, a * c * cb], [b * a * cg, b * b, b * c * ca], [c * a * cb, c * b * ca, c * c]],
-            dtype=float,
-        )
+        return
+
+    def _updateMetrics(self):
+        """Update the `metrics` tensor from the cell lengths and cosines."""
+        a, b, c = self._a, self._b, self._c
+        # fill the matrix directly, this is faster than numpy.array(nested_list)
+        M = numpy.empty((3, 3), dtype=float)
+        M[0, 0] = a * a
+        M[1, 1] = b * b
+        M[2, 2] = c * c
+        M[0, 1] = M[1, 0] = a * b * self._cg
+        M[0, 2] = M[2, 0] = a * c * self._cb
+        M[1, 2] = M[2, 1] = b * c * self._ca
+        self.metrics = M
+        return
+
+    def _updateStdbase(self):
+        """Update the upper-triangular `stdbase` matrix of base vectors
+        in the standard orientation.
+        """
+        ar = self._ar
+        S = numpy.zeros((3, 3), dtype=float)
+        S[0, 0] = 1.0 / ar
+        # subtract from 0.0 to avoid negative zero for right angles
+        S[0, 1] = 0.0 - self._cgr / self._sgr / ar
+        S[0, 2] = self._cb * self._a
+        S[1, 1] = self._b * self._sa
+        S[1, 2] = self._b * self._ca
+        S[2, 2] = self._c
+        self.stdbase = S
         return
 
     def abcABG(self):
@@ -513,21 +632,30 @@ class Lattice(object):
         dp = (u * numpy.dot(v, self.metrics)).sum(axis=-1)
         return dp
 
-    def norm(self, xyz):
+    def norm(self, xyz, out=None):
         """Calculate norm of a lattice vector.
 
         Parameters
         ----------
         xyz : array_like
             A vector or an Nx3 array of fractional coordinates.
+        out : numpy.ndarray, Optional
+            The array of shape ``xyz.shape[:-1]`` where to store
+            the result. A new array is allocated when not specified.
 
         Returns
         -------
         float or numpy.ndarray
             The magnitude of the lattice vector *xyz*.
         """
-        # this is a few percent faster than sqrt(dot(u, u)).
-        return numpy.sqrt((self.cartesian(xyz) ** 2).sum(axis=-1))
+        rc = self.cartesian(xyz)
+        # use the 1-D overload of numpy.dot for a single vector
+        if out is None and rc.ndim == 1:
+            return numpy.float64(math.sqrt(numpy.dot(rc, rc)))
+        if out is None:
+            return numpy.sqrt(numpy.einsum("...i,...i->...", rc, rc))
+        numpy.einsum("...i,...i->...", rc, rc, out=out)
+        return numpy.sqrt(out, out=out)
 
     def rnorm(self, hkl):
         """Calculate norm of a reciprocal vector.
@@ -545,7 +673,7 @@ class Lattice(object):
         hklcartn = numpy.dot(hkl, self.recbase.T)
         return numpy.sqrt((hklcartn**2).sum(axis=-1))
 
-    def dist(self, u, v):
+    def dist(self, u, v, out=None):
         """Calculate distance between 2 points in lattice coordinates.
 
         Parameters
@@ -554,18 +682,25 @@ class Lattice(object):
             A vector or an Nx3 matrix of fractional coordinates.
         v : numpy.ndarray
             A vector or an Nx3 matrix of fractional coordinates.
+        out : numpy.ndarray, Optional
+            The array where to store the calculated distances.
+            Use this to avoid allocation of the result array
+            when evaluating many distances in a loop.
 
         Note
         ----
-        *u* and *v* must be of the same shape when matrices.
+        The shapes of *u* and *v* must be broadcastable over all but
+        the last axis. For example, *u* of shape ``(N, 1, 3)`` and *v*
+        of shape ``(M, 3)`` yield an NxM matrix of all pair distances
+        in a single vectorized evaluation.
 
         Returns
         -------
         float or numpy.ndarray
             The distance between lattice points *u* and *v*.
         """
-        duv = numpy.asarray(u) - v
-        return self.norm(duv)
+        duv = numpy.subtract(u, v)
+        return self.norm(duv, out=out)
 
     def angle(self, u, v):
         """Calculate angle between 2 lattice vectors in degrees.
@@ -582,7 +717,11 @@ class Lattice(object):
         float
             The angle between lattice vectors *u* and *v* in degrees.
         """
-        ca = self.dot(u, v) / (self.norm(u) * self.norm(v))
+        # transform to Cartesian coordinates only once and reuse them
+        # for the dot product and both vector norms.
+        ru = self.cartesian(u)
+        rv = self.cartesian(v)
+        ca = (ru * rv).sum(axis=-1) / numpy.sqrt((ru * ru).sum(axis=-1) * (rv * rv).sum(axis=-1))
         # avoid round-off errors that would make abs(ca) greater than 1
         if numpy.isscalar(ca):
             ca = max(min(ca, 1), -1)
@@ -618,13 +757,10 @@ class Lattice(object):
 
     def __repr__(self):
         """String representation of this lattice."""
-        I3 = numpy.identity(3, dtype=float)
-        rotbaseI3diff = max(numpy.reshape(numpy.fabs(self.baserot - I3), 9))
-        cartlatpar = numpy.array([1.0, 1.0, 1.0, 90.0, 90.0, 90.0])
-        latpardiff = cartlatpar - self.abcABG()
-        if rotbaseI3diff > self._epsilon:
+        isrotated = numpy.fabs(self.baserot - _identity3).max() > self._epsilon
+        if isrotated:
             s = "Lattice(base=%r)" % self.base
-        elif numpy.fabs(latpardiff).max() < self._epsilon:
+        elif max(abs(x - x0) for x, x0 in zip(self.abcABG(), _cartesian_abcABG)) < self._epsilon:
             s = "Lattice()"
         else:
             s = "Lattice(a=%g, b=%g, c=%g, alpha=%g, beta=%g, gamma=%g)" % self.abcABG()
@@ -658,6 +794,69 @@ def _isotropicunit(recnormbase):
     return isounit
 
 
+def _adjugate3(m):
+    """Calculate adjugate matrix and determinant of a 3x3 matrix.
+
+    The inverse matrix is the adjugate divided by the determinant.
+    The explicit cofactor expansion is several times faster than
+    `numpy.linalg.inv` for a single 3x3 matrix.
+
+    Parameters
+    ----------
+    m : numpy.ndarray
+        The 3x3 matrix.
+
+    Returns
+    -------
+    adj : numpy.ndarray
+        The 3x3 adjugate matrix, the transpose of the cofactor matrix.
+    det : float
+        The determinant of *m*.
+    """
+    (m00, m01, m02), (m10, m11, m12), (m20, m21, m22) = m.tolist()
+    c00 = m11 * m22 - m12 * m21
+    c01 = m12 * m20 - m10 * m22
+    c02 = m10 * m21 - m11 * m20
+    det = m00 * c00 + m01 * c01 + m02 * c02
+    adj = numpy.array(
+        [
+            [c00, m02 * m21 - m01 * m22, m01 * m12 - m02 * m11],
+            [c01, m00 * m22 - m02 * m20, m02 * m10 - m00 * m12],
+            [c02, m01 * m20 - m00 * m21, m00 * m11 - m01 * m10],
+        ],
+        dtype=float,
+    )
+    return adj, det
+
+
+def _invUpperTriangular3(m):
+    """Calculate inverse of an upper-triangular 3x3 matrix.
+
+    This is used for the `Lattice.stdbase` matrix, which is upper-triangular
+    by construction, and avoids a general-purpose LAPACK inversion.
+
+    Parameters
+    ----------
+    m : numpy.ndarray
+        The 3x3 upper-triangular matrix with a non-zero diagonal.
+
+    Returns
+    -------
+    numpy.ndarray
+        The inverse of *m*, which is also upper-triangular.
+    """
+    (m00, m01, m02), (_, m11, m12), (_, _, m22) = m.tolist()
+    r00 = 1.0 / m00
+    r11 = 1.0 / m11
+    r22 = 1.0 / m22
+    # subtract from 0.0 so that zero off-diagonal terms stay positive
+    r01 = 0.0 - m01 * r00 * r11
+    r12 = 0.0 - m12 * r11 * r22
+    r02 = 0.0 - (m01 * r12 + m02 * r22) * r00
+    rv = numpy.array([[r00, r01, r02], [0.0, r11, r12], [0.0, 0.0, r22]], dtype=float)
+    return rv
+
+
 # Module Constants -----------------------------------------------------------
 
 cartesian = Lattice()
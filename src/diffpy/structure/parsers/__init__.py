@@ -31,6 +31,8 @@ Content:
     * outputFormats: list of available output formats
 """
 
+import importlib
+
 from diffpy.structure.parsers.parser_index_mod import parser_index
 from diffpy.structure.parsers.structureparser import StructureParser
 from diffpy.structure.structureerrors import StructureFormatError
@@ -63,10 +65,8 @@ def getParser(format, **kw):
         emsg = "no parser for '%s' format" % format
         raise StructureFormatError(emsg)
     pmod = parser_index[format]["module"]
-    ns = {}
-    import_cmd = "from diffpy.structure.parsers import %s as pm" % pmod
-    exec(import_cmd, ns)
-    return ns["pm"].getParser(**kw)
+    pm = importlib.import_module("diffpy.structure.parsers." + pmod)
+    return pm.getParser(**kw)
 
 
 def inputFormats():
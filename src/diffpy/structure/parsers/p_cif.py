@@ -31,6 +31,7 @@ import io
 import re
 import sys
 from contextlib import contextmanager
+from fractions import Fraction
 
 import numpy
 
@@ -810,6 +811,48 @@ symvec["+x"] = symvec["x"]
 symvec["+y"] = symvec["y"]
 symvec["+z"] = symvec["z"]
 
+# signed numeric terms of a translation such as "1/2", "-0.25" or "+1.5/3"
+_rx_symop_number = r"(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?"
+_rx_symop_translation = re.compile(r"([-+]?%s)(?:/(%s))?" % (_rx_symop_number, _rx_symop_number))
+
+
+def _symopTranslation(tpart):
+    """Evaluate translation part of a symmetry operation formula.
+
+    Parameters
+    ----------
+    tpart : str
+        Sum of signed numbers or fractions, for example ``"1/2"``,
+        ``"-0.25+1/3"`` or an empty string.
+
+    Returns
+    -------
+    float
+        The translation value.
+
+    Raises
+    ------
+    ValueError
+        When `tpart` is not a sum of numbers or fractions.
+    """
+    rv = 0.0
+    pos = 0
+    while pos < len(tpart):
+        mx = _rx_symop_translation.match(tpart, pos)
+        if not mx:
+            emsg = "Invalid translation in symmetry operation %r." % tpart
+            raise ValueError(emsg)
+        num, den = mx.groups()
+        if den is None:
+            rv += float(num)
+        elif num.lstrip("+-").isdigit() and den.isdigit():
+            # exact rational for integer fractions
+            rv += float(Fraction(int(num), int(den)))
+        else:
+            rv += float(num) / float(den)
+        pos = mx.end()
+    return rv
+
 
 def getSymOp(s):
     """Create `SpaceGroups.SymOp` instance from a string.
@@ -835,7 +878,7 @@ def getSymOp(s):
         for Rpart in eqparts[1::2]:
             R[i, :] += symvec[Rpart.lower()]
         for tpart in eqparts[::2]:
-            t[i] += eval("1.0*%s+0" % tpart)
+            t[i] += _symopTranslation(tpart)
     t -= numpy.floor(t)
     rv = SymOp(R, t)
     return rv
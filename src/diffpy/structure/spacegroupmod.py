@@ -275,6 +275,27 @@ class SpaceGroup(object):
         """
         return iter(self.symop_list)
 
+    def _get_symop_arrays(self):
+        """Return rotations and translations of all symmetry operations.
+
+        The arrays are cached and rebuilt only when `symop_list`
+        is replaced or changes its length.
+
+        Returns
+        -------
+        R : numpy.ndarray
+            The rotation matrices stacked in a ``(M, 3, 3)`` array.
+        t : numpy.ndarray
+            The translation vectors stacked in a ``(M, 3)`` array.
+        """
+        cached = self.__dict__.get("_symop_arrays")
+        symops = self.symop_list
+        if cached is None or cached[0] is not symops or len(cached[1]) != len(symops):
+            R = numpy.array([op.R for op in symops], dtype=float).reshape(-1, 3, 3)
+            t = numpy.array([op.t for op in symops], dtype=float).reshape(-1, 3)
+            cached = self._symop_arrays = (symops, R, t)
+        return cached[1:]
+
     def check_group_name(self, name):
         """Check if given name matches this space group.
 
@@ -16,13 +16,15 @@
 """This module defines class `Structure`.
 """
 
-import codecs
 import copy as copymod
+import os.path
+from itertools import compress
 
 import numpy
 
-from diffpy.structure.atom import Atom
+from diffpy.structure.atom import Atom, _UtoB
 from diffpy.structure.lattice import Lattice
+from diffpy.structure.parsers import getParser
 from diffpy.structure.utils import _linkAtomAttribute, atomBareSymbol, isiterable
 
 # ----------------------------------------------------------------------------
@@ -87,6 +89,9 @@ class Structure(list):
     pdffit = None
     """None: default values for `pdffit`."""
 
+    # cached labels of all atoms and their map to atom indices
+    _labelindex = None
+
     def __init__(self, atoms=None, lattice=None, title=None, filename=None, format=None):
         # if filename is specified load it and return
         if filename is not None:
@@ -129,14 +134,17 @@ class Structure(list):
         -------
         A duplicate instance of this object.
         """
-        if target is None:
-            target = Structure()
-        elif target is self:
+        if target is self:
             return target
+        lattice = Lattice(self.lattice)
+        # avoid constructing a default lattice for a new target
+        if target is None:
+            target = Structure(lattice=lattice)
+        else:
+            target.lattice = lattice
         # copy attributes as appropriate:
         target.title = self.title
-        target.lattice = Lattice(self.lattice)
-        target.pdffit = copymod.deepcopy(self.pdffit)
+        target.pdffit = _copyPDFFitData(self.pdffit)
         # copy all atoms to the target
         target[:] = self
         return target
@@ -144,7 +152,7 @@ class Structure(list):
     def __str__(self):
         """Simple string representation."""
         s_lattice = "lattice=%s" % self.lattice
-        s_atoms = "\n".join([str(a) for a in self])
+        s_atoms = "\n".join(map(str, self))
         return s_lattice + "\n" + s_atoms
 
     def addNewAtom(self, *args, **kwargs):
@@ -172,14 +180,19 @@ class Structure(list):
         where baresymbol is the element right-stripped of "[0-9][+-]".
         """
         elnum = {}
+        # evaluate bare symbol only once for each distinct element
+        baresymbols = {}
         # support duplicate atom instances
         islabeled = set()
         for a in self:
             if a in islabeled:
                 continue
-            baresmbl = atomBareSymbol(a.element)
-            elnum[baresmbl] = elnum.get(baresmbl, 0) + 1
-            a.label = baresmbl + str(elnum[baresmbl])
+            smbl = a.element
+            baresmbl = baresymbols.get(smbl)
+            if baresmbl is None:
+                baresmbl = baresymbols[smbl] = atomBareSymbol(smbl)
+            n = elnum[baresmbl] = elnum.get(baresmbl, 0) + 1
+            a.label = baresmbl + str(n)
             islabeled.add(a)
         return
 
@@ -204,9 +217,73 @@ class Structure(list):
             If any of the `Atom` indices or labels are invalid.
         """
         # lookup by labels
-        a0, a1 = self[aid0, aid1]
+        a0, a1 = self.__getAtoms((aid0, aid1))
         return self.lattice.dist(a0.xyz, a1.xyz)
 
+    def distances(self, aids0=None, aids1=None, pbc=False):
+        """Calculate distances between groups of `Atoms`.
+
+        Parameters
+        ----------
+        aids0 : Iterable, Optional
+            Zero based indices or string labels of the first `Atoms`.
+            This can be also a boolean mask, a slice, or a single index
+            or label.  Use all `Atoms` when not specified.
+        aids1 : Iterable, Optional
+            Indices or labels of the second `Atoms`.  Same as `aids0`
+            when not specified.
+        pbc : bool, Optional
+            Apply periodic boundary conditions using the minimum image
+            convention, where each fractional coordinate difference is
+            wrapped into the ``[-0.5, 0.5]`` range.  This finds the nearest
+            image for orthogonal cells, but may miss a shorter one in
+            strongly oblique cells.  Default is ``False``.
+
+        Returns
+        -------
+        numpy.ndarray
+            The matrix of distances in Angstroms, where element ``[i, j]``
+            is the distance between atoms ``aids0[i]`` and ``aids1[j]``.
+
+        Raises
+        ------
+        IndexError
+            If any of the `Atom` indices or labels are invalid.
+
+        Examples
+        --------
+        All interatomic distances in the structure:
+
+        >>> stru.distances()
+
+        Distances from the ``'Na1'`` atom to all chlorine atoms:
+
+        >>> stru.distances(['Na1'], stru.element == 'Cl')[0]
+
+        Nearest periodic distances between all atoms:
+
+        >>> stru.distances(pbc=True)
+        """
+        xyz = numpy.reshape(self.xyz, (-1, 3))
+        xyz0 = xyz[self.__atomIndices(aids0)]
+        xyz1 = xyz0 if aids1 is None else xyz[self.__atomIndices(aids1)]
+        if pbc:
+            # wrap fractional differences to the nearest periodic image
+            duvw = [numpy.subtract.outer(u0, u1) for u0, u1 in zip(xyz0.T, xyz1.T)]
+            for d in duvw:
+                d -= numpy.rint(d)
+            dcomponents = (sum(d * b for d, b in zip(duvw, bk)) for bk in self.lattice.base.T)
+        else:
+            xyzc0 = self.lattice.cartesian(xyz0)
+            xyzc1 = self.lattice.cartesian(xyz1)
+            dcomponents = (numpy.subtract.outer(c0, c1) for c0, c1 in zip(xyzc0.T, xyzc1.T))
+        # accumulate squared differences one coordinate at a time so that
+        # the temporary arrays stay at the size of the distance matrix
+        rv = numpy.zeros((len(xyz0), len(xyz1)))
+        for dc in dcomponents:
+            rv += numpy.square(dc, out=dc)
+        return numpy.sqrt(rv, out=rv)
+
     def angle(self, aid0, aid1, aid2):
         """
         The bond angle at the second of three `Atoms` in degrees.
@@ -230,11 +307,48 @@ class Structure(list):
         IndexError
             If any of the arguments are invalid.
         """
-        a0, a1, a2 = self[aid0, aid1, aid2]
+        a0, a1, a2 = self.__getAtoms((aid0, aid1, aid2))
         u10 = a0.xyz - a1.xyz
         u12 = a2.xyz - a1.xyz
         return self.lattice.angle(u10, u12)
 
+    def angles(self, triplets):
+        """Calculate bond angles for many triplets of `Atoms` at once.
+
+        Parameters
+        ----------
+        triplets : Iterable
+            Sequence of ``(aid0, aid1, aid2)`` triplets of zero based
+            indices or string labels, or an integer array of shape ``(K, 3)``.
+            Each angle is formed at the second `Atom` of its triplet,
+            same as in `angle`.
+
+        Returns
+        -------
+        numpy.ndarray
+            The bond angles in degrees.
+
+        Raises
+        ------
+        IndexError
+            If any of the `Atom` indices or labels are invalid.
+        ValueError
+            If `triplets` cannot be arranged in rows of three `Atoms`.
+
+        Examples
+        --------
+        >>> stru.angles([(0, 1, 2), ('Cl1', 'Na1', 'Cl2')])
+        """
+        ijk = numpy.asarray(triplets)
+        if ijk.dtype.kind not in "iu":
+            aids = [aid for t in triplets for aid in t]
+            ijk = numpy.array(self.__resolveLabels(aids), dtype=int)
+        xyz = numpy.reshape(self.xyz, (-1, 3))
+        xt = xyz[ijk.reshape(-1, 3)]
+        u10 = xt[:, 0] - xt[:, 1]
+        u12 = xt[:, 2] - xt[:, 1]
+        return self.lattice.angle(u10, u12)
+
     def placeInLattice(self, new_lattice):
         """place structure into `new_lattice` coordinate system.
 
@@ -254,10 +368,16 @@ class Structure(list):
         """
         Tx = numpy.dot(self.lattice.base, new_lattice.recbase)
         Tu = numpy.dot(self.lattice.normbase, new_lattice.recnormbase)
-        for a in self:
-            a.xyz = numpy.dot(a.xyz, Tx)
-            if a.anisotropy:
-                a.U = numpy.dot(numpy.transpose(Tu), numpy.dot(a.U, Tu))
+        # transform all coordinates at once and write them back in place
+        xyz = numpy.dot(numpy.reshape(self.xyz, (-1, 3)), Tx)
+        for a, xyz1 in zip(self, xyz):
+            a.xyz[:] = xyz1
+        aatoms = [a for a in self if a.anisotropy]
+        if aatoms:
+            Ustack = numpy.array([a.U for a in aatoms])
+            Ustack = numpy.matmul(numpy.matmul(Tu.T, Ustack), Tu)
+            for a, U1 in zip(aatoms, Ustack):
+                a.U = U1
         self.lattice = new_lattice
         return self
 
@@ -278,21 +398,11 @@ class Structure(list):
             Return instance of data Parser used to process input string. This
             can be inspected for information related to particular format.
         """
-        import diffpy.structure
-        import diffpy.structure.parsers
-
-        getParser = diffpy.structure.parsers.getParser
         p = getParser(format)
         new_structure = p.parseFile(filename)
         # reinitialize data after successful parsing
-        # avoid calling __init__ from a derived class
-        Structure.__init__(self)
-        if new_structure is not None:
-            self.__dict__.update(new_structure.__dict__)
-            self[:] = new_structure
+        self.__adoptStructure(new_structure)
         if not self.title:
-            import os.path
-
             tailname = os.path.basename(filename)
             tailbase = os.path.splitext(tailname)[0]
             self.title = tailbase
@@ -315,16 +425,10 @@ class Structure(list):
             Return instance of data Parser used to process input string. This
             can be inspected for information related to particular format.
         """
-        from diffpy.structure.parsers import getParser
-
         p = getParser(format)
         new_structure = p.parse(s)
         # reinitialize data after successful parsing
-        # avoid calling __init__ from a derived class
-        Structure.__init__(self)
-        if new_structure is not None:
-            self.__dict__.update(new_structure.__dict__)
-            self[:] = new_structure
+        self.__adoptStructure(new_structure)
         return p
 
     def write(self, filename, format):
@@ -343,12 +447,11 @@ class Structure(list):
 
             ``from parsers import formats``
         """
-        from diffpy.structure.parsers import getParser
-
         p = getParser(format)
         p.filename = filename
         s = p.tostring(self)
-        with codecs.open(filename, "w", encoding="UTF-8") as fp:
+        # newline="" keeps the line endings of s unchanged on all platforms
+        with open(filename, "w", encoding="UTF-8", newline="") as fp:
             fp.write(s)
         return
 
@@ -361,8 +464,6 @@ class Structure(list):
 
             ``from parsers import formats``
         """
-        from diffpy.structure.parsers import getParser
-
         p = getParser(format)
         s = p.tostring(self)
         return s
@@ -384,7 +485,7 @@ class Structure(list):
         copy : bool, Optional
             Flag for appending a copy of `a`. When ``False``, append `a` and update `a.lattice`.
         """
-        adup = copy and Atom(a) or a
+        adup = copy and a.__copy__() or a
         adup.lattice = self.lattice
         super(Structure, self).append(adup)
         return
@@ -401,7 +502,7 @@ class Structure(list):
         copy : bool, Optional
             Flag for inserting a copy of `a`. When ``False``, append `a` and update `a.lattice`.
         """
-        adup = copy and copymod.copy(a) or a
+        adup = copy and a.__copy__() or a
         adup.lattice = self.lattice
         super(Structure, self).insert(idx, adup)
         return
@@ -421,7 +522,7 @@ class Structure(list):
             The default behavior is to make copies when `atoms` are of
             `Structure` type or if new atoms introduce repeated objects.
         """
-        adups = (copymod.copy(a) for a in atoms)
+        adups = (a.__copy__() for a in atoms)
         if copy is None:
             if isinstance(atoms, Structure):
                 newatoms = adups
@@ -429,7 +530,7 @@ class Structure(list):
                 memo = set(id(a) for a in self)
 
                 def nextatom(a):
-                    return a if id(a) not in memo else copymod.copy(a)
+                    return a if id(a) not in memo else a.__copy__()
 
                 def mark(a):
                     return (memo.add(id(a)), a)[-1]
@@ -440,10 +541,13 @@ class Structure(list):
         else:
             newatoms = atoms
 
+        lattice = self.lattice
+
         def setlat(a):
-            return (setattr(a, "lattice", self.lattice), a)[-1]
+            a.lattice = lattice
+            return a
 
-        super(Structure, self).extend(setlat(a) for a in newatoms)
+        super(Structure, self).extend(map(setlat, newatoms))
         return
 
     def __getitem__(self, idx):
@@ -496,44 +600,24 @@ class Structure(list):
             return rv
         except TypeError:
             pass
-        # check if there is any string label that should be resolved
-        scalarstringlabel = isinstance(idx, str)
-        hasstringlabel = scalarstringlabel or (isiterable(idx) and any(isinstance(ii, str) for ii in idx))
+        # check if there is any string label that should be resolved,
+        # numeric and boolean arrays cannot contain any
+        if isinstance(idx, numpy.ndarray) and idx.dtype.kind in "biu":
+            hasstringlabel = False
+        else:
+            hasstringlabel = isinstance(idx, str) or (isiterable(idx) and any(isinstance(ii, str) for ii in idx))
         # if not, use numpy indexing to resolve idx
         if not hasstringlabel:
             idx1 = idx
             if type(idx) is tuple:
                 idx1 = numpy.r_[idx]
             indices = numpy.arange(len(self))[idx1]
-            rhs = [list.__getitem__(self, i) for i in indices]
+            rhs = [list.__getitem__(self, i) for i in indices.tolist()]
             rv = self.__emptySharedStructure()
             rv.extend(rhs, copy=False)
             return rv
         # here we need to resolve at least one string label
-        # build a map of labels to indices and mark duplicate labels
-        duplicate = object()
-        labeltoindex = {}
-        for i, a in enumerate(self):
-            labeltoindex[a.label] = duplicate if a.label in labeltoindex else i
-
-        def _resolveindex(aid):
-            aid1 = aid
-            if type(aid) is str:
-                aid1 = labeltoindex.get(aid, None)
-                if aid1 is None:
-                    raise IndexError("Invalid atom label %r." % aid)
-                if aid1 is duplicate:
-                    raise IndexError("Atom label %r is not unique." % aid)
-            return aid1
-
-        # generate new index object that has no strings
-        if scalarstringlabel:
-            idx2 = _resolveindex(idx)
-        # for iterables preserve the tuple object type
-        else:
-            idx2 = [_resolveindex(i) for i in idx]
-            if type(idx) is tuple:
-                idx2 = tuple(idx2)
+        idx2 = self.__resolveLabels(idx)
         # call this function again and hope there is no recursion loop
         rv = self[idx2]
         return rv
@@ -552,22 +636,28 @@ class Structure(list):
             the `lattice` attribute of `Atom` objects present in value.
             Default is ``True``.
         """
+        lattice = self.lattice
         # handle slice assignment
         if isinstance(idx, slice):
 
             def _fixlat(a):
-                a.lattice = self.lattice
+                a.lattice = lattice
                 return a
 
             v1 = value
             if copy:
-                keep = set(super(Structure, self).__getitem__(idx))
-                v1 = (a if a in keep else Atom(a) for a in value)
-            vfinal = filter(_fixlat, v1)
+                keep = super(Structure, self).__getitem__(idx)
+                # a fresh copy target has nothing to keep
+                if keep:
+                    keep = set(keep)
+                    v1 = (a if a in keep else a.__copy__() for a in value)
+                else:
+                    v1 = (a.__copy__() for a in value)
+            vfinal = map(_fixlat, v1)
         # handle scalar assingment
         else:
-            vfinal = Atom(value) if copy else value
-            vfinal.lattice = self.lattice
+            vfinal = value.__copy__() if copy else value
+            vfinal.lattice = lattice
         super(Structure, self).__setitem__(idx, vfinal)
         return
 
@@ -618,8 +708,8 @@ class Structure(list):
             New `Structure` with a copy of `Atom` instances.
         """
         otherset = set(other)
-        keepindices = [i for i, a in enumerate(self) if a not in otherset]
-        rv = copymod.copy(self[keepindices])
+        rv = copymod.copy(self[:0])
+        rv.extend((a for a in self if a not in otherset), copy=True)
         return rv
 
     def __isub__(self, other):
@@ -636,7 +726,8 @@ class Structure(list):
             Reference to this `Structure` object.
         """
         otherset = set(other)
-        self[:] = [a for a in self if a not in otherset]
+        # remaining atoms are already owned by this structure
+        self.__setitem__(slice(None), [a for a in self if a not in otherset], copy=False)
         return self
 
     def __mul__(self, n):
@@ -713,7 +804,7 @@ class Structure(list):
         """Character array of `Atom` types. Assignment updates
         the element attribute of the respective `Atoms`.
         Set the maximum length of the element string to 5 characters.""",
-        toarray=lambda items: numpy.char.array(items, itemsize=5),
+        toarray=lambda items: numpy.array(items, dtype="U5").view(numpy.char.chararray),
     )
 
     xyz = _linkAtomAttribute(
@@ -745,7 +836,7 @@ class Structure(list):
         """Character array of `Atom` names. Assignment updates
         the label attribute of all `Atoms`.
         Set the maximum length of the label string to 5 characters.""",
-        toarray=lambda items: numpy.char.array(items, itemsize=5),
+        toarray=lambda items: numpy.array(items, dtype="U5").view(numpy.char.chararray),
     )
 
     occupancy = _linkAtomAttribute(
@@ -754,9 +845,32 @@ class Structure(list):
         occupancy attribute of all `Atoms`.""",
     )
 
-    xyz_cartn = _linkAtomAttribute(
-        "xyz_cartn",
-        """Array of absolute Cartesian coordinates of all `Atoms`.
+    def _get_xyz_cartn(self):
+        lat = self.lattice
+        # use per-atom values if some atom has a different lattice
+        if not len(self) or lat is None or not all(a.lattice is lat for a in self):
+            return numpy.array([a.xyz_cartn for a in self])
+        # otherwise transform all fractional coordinates at once
+        return lat.cartesian(numpy.reshape(self.xyz, (-1, 3)))
+
+    def _set_xyz_cartn(self, value):
+        n = len(self)
+        if n == 0:
+            return
+        lat = self.lattice
+        xyzc = numpy.broadcast_to(value, (n, 3))
+        if lat is None or not all(a.lattice is lat for a in self):
+            for a, v in zip(self, xyzc):
+                a.xyz_cartn = v
+            return
+        for a, v in zip(self, lat.fractional(xyzc)):
+            a.xyz[:] = v
+        return
+
+    xyz_cartn = property(
+        _get_xyz_cartn,
+        _set_xyz_cartn,
+        doc="""Array of absolute Cartesian coordinates of all `Atoms`.
         Assignment updates the `xyz` attribute of all `Atoms`.""",
     )
 
@@ -772,97 +886,263 @@ class Structure(list):
         Assignment updates the U and anisotropy attributes of all `Atoms`.""",
     )
 
+    def _get_Uisoequiv(self):
+        lat = self.lattice
+        # use per-atom values if some atom has a different lattice
+        if not all(a.lattice is lat for a in self):
+            return numpy.array([a.Uisoequiv for a in self])
+        # otherwise evaluate the equivalent values for all atoms at once
+        Uraw = numpy.reshape([a._U for a in self], (-1, 3, 3))
+        rv = Uraw[:, 0, 0].copy()
+        aniso = numpy.array([a.anisotropy for a in self], dtype=bool)
+        if aniso.any():
+            G = numpy.identity(3) if lat is None else numpy.dot(lat.normbase, lat.normbase.T)
+            rv[aniso] = numpy.einsum("nij,ij->n", Uraw[aniso], G) / 3.0
+        return rv
+
     Uisoequiv = _linkAtomAttribute(
         "Uisoequiv",
         """Array of isotropic thermal displacement or equivalent values.
         Assignment updates the U attribute of all `Atoms`.""",
-    )
+    ).getter(_get_Uisoequiv)
+
+    def _get_Uij(self, i, j):
+        lat = self.lattice
+        # use per-atom values if some atom has a different lattice
+        if not all(a.lattice is lat for a in self):
+            return numpy.array([a._get_Uij(i, j) for a in self])
+        # otherwise read the raw tensor elements of all atoms at once
+        k = 3 * i + j
+        rv = numpy.array([a._U.item(k) for a in self], dtype=float)
+        iso = ~numpy.array([a._anisotropy for a in self], dtype=bool)
+        if iso.any():
+            unit = numpy.identity(3) if lat is None else lat.isotropicunit
+            Uiso = numpy.array([a._U.item(0) for a in compress(self, iso)])
+            rv[iso] = Uiso * unit[i, j]
+        return rv
 
     U11 = _linkAtomAttribute(
         "U11",
         """Array of `U11` elements of the anisotropic displacement tensors.
         Assignment updates the U and anisotropy attributes of all `Atoms`.""",
-    )
+    ).getter(lambda self: self._get_Uij(0, 0))
 
     U22 = _linkAtomAttribute(
         "U22",
         """Array of `U22` elements of the anisotropic displacement tensors.
         Assignment updates the U and anisotropy attributes of all `Atoms`.""",
-    )
+    ).getter(lambda self: self._get_Uij(1, 1))
 
     U33 = _linkAtomAttribute(
         "U33",
         """Array of `U33` elements of the anisotropic displacement tensors.
         Assignment updates the U and anisotropy attributes of all `Atoms`.""",
-    )
+    ).getter(lambda self: self._get_Uij(2, 2))
 
     U12 = _linkAtomAttribute(
         "U12",
         """Array of `U12` elements of the anisotropic displacement tensors.
         Assignment updates the U and anisotropy attributes of all `Atoms`.""",
-    )
+    ).getter(lambda self: self._get_Uij(0, 1))
 
     U13 = _linkAtomAttribute(
         "U13",
         """Array of `U13` elements of the anisotropic displacement tensors.
         Assignment updates the U and anisotropy attributes of all `Atoms`.""",
-    )
+    ).getter(lambda self: self._get_Uij(0, 2))
 
     U23 = _linkAtomAttribute(
         "U23",
         """Array of `U23` elements of the anisotropic displacement tensors.
         Assignment updates the U and anisotropy attributes of all `Atoms`.""",
-    )
+    ).getter(lambda self: self._get_Uij(1, 2))
 
     Bisoequiv = _linkAtomAttribute(
         "Bisoequiv",
         """Array of Debye-Waller isotropic thermal displacement or equivalent
         values. Assignment updates the U attribute of all `Atoms`.""",
-    )
+    ).getter(lambda self: _UtoB * self._get_Uisoequiv())
 
     B11 = _linkAtomAttribute(
         "B11",
         """Array of `B11` elements of the Debye-Waller displacement tensors.
         Assignment updates the U and anisotropy attributes of all `Atoms`.""",
-    )
+    ).getter(lambda self: _UtoB * self._get_Uij(0, 0))
 
     B22 = _linkAtomAttribute(
         "B22",
         """Array of `B22` elements of the Debye-Waller displacement tensors.
         Assignment updates the U and anisotropy attributes of all `Atoms`.""",
-    )
+    ).getter(lambda self: _UtoB * self._get_Uij(1, 1))
 
     B33 = _linkAtomAttribute(
         "B33",
         """Array of `B33` elements of the Debye-Waller displacement tensors.
         Assignment updates the U and anisotropy attributes of all `Atoms`.""",
-    )
+    ).getter(lambda self: _UtoB * self._get_Uij(2, 2))
 
     B12 = _linkAtomAttribute(
         "B12",
         """Array of `B12` elements of the Debye-Waller displacement tensors.
         Assignment updates the U and anisotropy attributes of all `Atoms`.""",
-    )
+    ).getter(lambda self: _UtoB * self._get_Uij(0, 1))
 
     B13 = _linkAtomAttribute(
         "B13",
         """Array of `B13` elements of the Debye-Waller displacement tensors.
         Assignment updates the U and anisotropy attributes of all `Atoms`.""",
-    )
+    ).getter(lambda self: _UtoB * self._get_Uij(0, 2))
 
     B23 = _linkAtomAttribute(
         "B23",
         """Array of `B23` elements of the Debye-Waller displacement tensors.
         Assignment updates the U and anisotropy attributes of all `Atoms`.""",
-    )
+    ).getter(lambda self: _UtoB * self._get_Uij(1, 2))
 
     # Private Methods --------------------------------------------------------
 
+    def __resolveLabels(self, idx):
+        """Return copy of `idx` with string labels replaced by integer indices.
+
+        Parameters
+        ----------
+        idx : str or Iterable
+            String label or an iterable with string labels and indices.
+
+        Returns
+        -------
+        int or list or tuple
+            Integer index for a scalar `idx` or a list of indices for
+            an iterable.  Tuples are returned as tuples.
+
+        Raises
+        ------
+        IndexError
+            If the `Atom` label is invalid or not unique.
+        """
+        # Reuse the map of labels to indices from the last call if the
+        # atom labels did not change.  Comparing the labels is several
+        # times faster than building the map.
+        labels = [a.label for a in self]
+        if self._labelindex is None or self._labelindex[0] != labels:
+            # build a map of labels to indices and mark duplicates with None
+            labeltoindex = {}
+            for i, lb in enumerate(labels):
+                labeltoindex[lb] = None if lb in labeltoindex else i
+            self._labelindex = (labels, labeltoindex)
+        labeltoindex = self._labelindex[1]
+
+        def _resolveindex(aid):
+            aid1 = aid
+            if isinstance(aid, str):
+                aid1 = labeltoindex.get(aid, None)
+                if aid1 is None and aid in labeltoindex:
+                    raise IndexError("Atom label %r is not unique." % aid)
+                if aid1 is None:
+                    raise IndexError("Invalid atom label %r." % aid)
+            return aid1
+
+        # generate new index object that has no strings
+        if isinstance(idx, str):
+            rv = _resolveindex(idx)
+        # for iterables preserve the tuple object type
+        else:
+            rv = [_resolveindex(i) for i in idx]
+            if type(idx) is tuple:
+                rv = tuple(rv)
+        return rv
+
+    def __atomIndices(self, aids):
+        """Return numpy index for `Atoms` given by indices or string labels.
+
+        Return the full slice when `aids` is ``None``.  A single index
+        or label is converted to a 1-element index array.
+        """
+        if aids is None:
+            return slice(None)
+        if isinstance(aids, slice):
+            return aids
+        if isinstance(aids, (str, int, numpy.integer)):
+            aids = [aids]
+        if any(isinstance(aid, str) for aid in aids):
+            aids = self.__resolveLabels(aids)
+        rv = numpy.asarray(aids)
+        # allow empty lists and tuples
+        if rv.size == 0:
+            rv = rv.astype(int)
+        return rv
+
+    def __getAtoms(self, aids):
+        """Return a list of `Atoms` for a tuple of indices or string labels.
+
+        This is a faster variant of ``self[aids]`` for the few `Atoms`
+        used in `distance` and `angle`, as it does not build a substructure.
+        """
+        if any(isinstance(aid, str) for aid in aids):
+            aids = self.__resolveLabels(aids)
+        rv = [list.__getitem__(self, aid) for aid in aids]
+        return rv
+
+    def __adoptStructure(self, stru):
+        """Take over lattice, metadata and atoms of a parsed `Structure`.
+
+        The atoms of stru are copied, because parsers such as `P_cif`
+        keep references to them after parsing.
+
+        Parameters
+        ----------
+        stru : Structure or None
+            Freshly parsed structure.  When ``None`` only make sure
+            that this `Structure` has a `lattice`.
+        """
+        if stru is None:
+            if self.lattice is None:
+                self.lattice = Lattice()
+            return
+        self.__dict__.update(stru.__dict__)
+        self[:] = stru
+        return
+
     def __emptySharedStructure(self):
         """Return empty `Structure` with standard attributes same as in self."""
-        rv = Structure()
+        rv = Structure(lattice=self.lattice)
         rv.__dict__.update([(k, getattr(self, k)) for k in rv.__dict__])
         return rv
 
 
 # End of class Structure
+
+# Local Helpers --------------------------------------------------------------
+
+_scalartypes = (int, float, str, bool, type(None))
+
+
+def _copyPDFFitData(pdffit):
+    """Return a deep copy of the `Structure.pdffit` dictionary.
+
+    The usual dictionary of scalars and lists of scalars is copied
+    directly, which is much faster than the generic `copy.deepcopy`.
+
+    Parameters
+    ----------
+    pdffit : dict or None
+        The PDFFit-related metadata to be copied.
+
+    Returns
+    -------
+    dict or None
+        The independent copy of `pdffit`.
+    """
+    if pdffit is None:
+        return None
+    if type(pdffit) is not dict:
+        return copymod.deepcopy(pdffit)
+    rv = {}
+    for k, v in pdffit.items():
+        if type(v) in _scalartypes:
+            rv[k] = v
+        elif type(v) is list and all(type(x) in _scalartypes for x in v):
+            rv[k] = list(v)
+        else:
+            return copymod.deepcopy(pdffit)
+    return rv
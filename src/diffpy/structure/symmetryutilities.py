@@ -110,6 +110,12 @@ def isSpaceGroupLatPar(spacegroup, a, b, c, alpha, beta, gamma):
 
 _rx_constant_formula = re.compile(r"[-+]?(\d+(\.\d*)?|\.\d+)([eE][-+]?\d+)??(/[-+]?\d+)?$")
 
+# Regular expressions for removing unit factors from position
+# and displacement formulas built by GeneratorSite.
+
+_rx_unit_factor_xyz = re.compile(r"^[+]1[*]|(?<=[+-])1[*]")
+_rx_unit_factor_U = re.compile(r"^[+]?1[*]|^[+](?=\d)|(?<=[+-])1[*]")
+
 
 def isconstantFormula(s):
     """Check if formula string is constant.
@@ -277,11 +283,12 @@ def expandPosition(spacegroup, xyz, sgoffset=[0, 0, 0], eps=None):
     pos2tuple = _Position2Tuple(eps)
     positions = []
     site_symops = {}  # position tuples with [related symops]
-    for symop in spacegroup.iter_symops():
-        # operate on coordinates in non-shifted spacegroup
-        pos = symop(xyz + sgoffset) - sgoffset
-        mask = numpy.logical_or(pos < 0.0, pos >= 1.0)
-        pos[mask] -= numpy.floor(pos[mask])
+    # operate on coordinates in non-shifted spacegroup, all at once
+    R, t = spacegroup._get_symop_arrays()
+    allpos = numpy.dot(R, xyz + sgoffset) + t - sgoffset
+    mask = numpy.logical_or(allpos < 0.0, allpos >= 1.0)
+    allpos[mask] -= numpy.floor(allpos[mask])
+    for symop, pos in zip(spacegroup.iter_symops(), allpos):
         tpl = pos2tuple(pos)
         if tpl not in site_symops:
             pos_is_new = True
@@ -630,19 +637,20 @@ class GeneratorSite(object):
             teqpos -= nvec * varvalue
         # map varnames to xyzsymbols
         name2sym = dict(zip(("x", "y", "z"), xyzsymbols))
-        xyzformula = 3 * [""]
-        for nvec, (vname, ignore) in zip(nsrotated, self.pparameters):
-            for i in range(3):
-                if abs(nvec[i]) < epsilon:
+        xyzterms = ([], [], [])
+        for nvec, (vname, ignore) in zip(nsrotated.tolist(), self.pparameters):
+            smbl = name2sym[vname]
+            for terms, nv in zip(xyzterms, nvec):
+                if abs(nv) < epsilon:
                     continue
-                xyzformula[i] += "%s*%s " % (self.signedRatStr(nvec[i]), name2sym[vname])
+                terms.append("%s*%s " % (self.signedRatStr(nv), smbl))
         # add constant offset teqpos to all formulas
-        for i in range(3):
-            if xyzformula[i] and abs(teqpos[i]) < epsilon:
+        for terms, tv in zip(xyzterms, teqpos.tolist()):
+            if terms and abs(tv) < epsilon:
                 continue
-            xyzformula[i] += self.signedRatStr(teqpos[i])
+            terms.append(self.signedRatStr(tv))
         # reduce unnecessary +1* and -1*
-        xyzformula = [re.sub("^[+]1[*]|(?<=[+-])1[*]", "", f).strip() for f in xyzformula]
+        xyzformula = [_rx_unit_factor_xyz.sub("", "".join(terms)).strip() for terms in xyzterms]
         return dict(zip(("x", "y", "z"), xyzformula))
 
     def UFormula(self, pos, Usymbols=stdUsymbols):
@@ -671,23 +679,21 @@ class GeneratorSite(object):
         # any rotation matrix should do fine
         R = self.symops[idx][0].R
         Rt = R.transpose()
-        Usrotated = [numpy.dot(R, numpy.dot(Us, Rt)) for Us in self.Uspace]
-        Uformula = dict.fromkeys(stdUsymbols, "")
+        Usrotated = numpy.matmul(R, numpy.matmul(self.Uspace, Rt))
+        # avoid adding off-diagonal elements twice
+        assert numpy.all(Usrotated == Usrotated.transpose(0, 2, 1))
+        Usrflat = numpy.triu(Usrotated).reshape(-1, 9).tolist()
+        Uterms = {smbl: [] for smbl in stdUsymbols}
         name2sym = dict(zip(stdUsymbols, Usymbols))
-        for Usr, (vname, ignore) in zip(Usrotated, self.Uparameters):
-            # avoid adding off-diagonal elements twice
-            assert numpy.all(Usr == Usr.T)
-            Usr -= numpy.tril(Usr, -1)
-            Usrflat = Usr.flatten()
-            for i in numpy.where(Usrflat)[0]:
-                f = "%+g*%s" % (Usrflat[i], name2sym[vname])
-                smbl = self.idx2Usymbol[i]
-                Uformula[smbl] += f
-        for smbl, f in Uformula.items():
-            if not f:
-                f = "0"
-            f = re.sub(r"^[+]?1[*]|^[+](?=\d)|(?<=[+-])1[*]", "", f).strip()
-            Uformula[smbl] = f
+        for Usrf, (vname, ignore) in zip(Usrflat, self.Uparameters):
+            Usmbl = name2sym[vname]
+            for i, u in enumerate(Usrf):
+                if u:
+                    Uterms[self.idx2Usymbol[i]].append("%+g*%s" % (u, Usmbl))
+        Uformula = {}
+        for smbl, terms in Uterms.items():
+            f = "".join(terms) or "0"
+            Uformula[smbl] = _rx_unit_factor_U.sub("", f).strip()
         return Uformula
 
     def eqIndex(self, pos):
@@ -89,37 +89,34 @@ def _linkAtomAttribute(attrname, doc, toarray=numpy.array):
     Return a property object.
     """
     from itertools import repeat
-    from operator import setitem
+    from operator import attrgetter
 
     _all = slice(None)
+    # attrgetter gathers the values in a C loop
+    getvalue = attrgetter(attrname)
 
     def fget(self):
-        va = toarray([getattr(a, attrname) for a in self])
+        va = toarray(list(map(getvalue, self)))
         return va
 
     def fset(self, value):
         n = len(self)
         if n == 0:
             return
-        v0 = getattr(self[0], attrname)
-        # replace scalar values, but change array attributes in place
-        if numpy.isscalar(v0):
-
-            def setvalue(a, v):
-                return setattr(a, attrname, v)
-
-        else:
-
-            def setvalue(a, v):
-                return setitem(getattr(a, attrname), _all, v)
-
+        v0 = getvalue(self[0])
         # avoid broadcasting if the new value is a scalar
         if numpy.isscalar(value):
             genvalues = repeat(value)
         else:
             genvalues = numpy.broadcast_to(value, (n,) + numpy.shape(v0))
-        for a, v in zip(self, genvalues):
-            setvalue(a, v)
+        # replace scalar values, but change array attributes in place.
+        # The loops are inlined to skip a helper call per atom.
+        if numpy.isscalar(v0):
+            for a, v in zip(self, genvalues):
+                setattr(a, attrname, v)
+        else:
+            for a, v in zip(self, genvalues):
+                getvalue(a)[_all] = v
         return
 
     rv = property(fget, fset, doc=doc)
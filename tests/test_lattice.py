@@ -44,6 +44,9 @@ class TestLattice(unittest.TestCase):
         L0.setLatBase(L0.cartesian([[1, 1, 0], [0, 1, 1], [1, 0, 1]]))
         L1 = Lattice(L0)
         self.assertTrue(numpy.array_equal(L0.base, L1.base))
+        self.assertFalse(numpy.shares_memory(L0.base, L1.base))
+        self.assertFalse(numpy.shares_memory(L0.metrics, L1.metrics))
+        self.assertEqual(repr(L0), repr(L1))
         L2 = Lattice(base=L0.base)
         self.assertTrue(numpy.array_equal(L0.base, L2.base))
         self.assertTrue(numpy.array_equal(L0.isotropicunit, L2.isotropicunit))
@@ -52,6 +55,22 @@ class TestLattice(unittest.TestCase):
         self.assertTrue(numpy.allclose(L0.isotropicunit, L3.isotropicunit))
         return
 
+    def test_cosd_sind(self):
+        """check exact values of cosd and sind."""
+        from diffpy.structure.lattice import _cosdsind, cosd, sind
+
+        self.assertEqual(0.0, cosd(90))
+        self.assertEqual(-0.5, cosd(-240))
+        self.assertEqual(0.5, sind(30))
+        self.assertEqual(-0.5, sind(-30))
+        self.assertEqual(0.0, sind(180))
+        self.assertEqual(-1.0, sind(630))
+        for x in numpy.arange(-360, 360, 7.5):
+            self.assertAlmostEqual(numpy.sin(numpy.radians(x)), sind(x), 15)
+            self.assertAlmostEqual(numpy.cos(numpy.radians(x)), cosd(x), 15)
+            self.assertEqual((cosd(x), sind(x)), _cosdsind(x))
+        return
+
     def test_setLatPar(self):
         """check calculation of standard unit cell vectors"""
         from math import cos, radians, sqrt
@@ -147,6 +166,8 @@ class TestLattice(unittest.TestCase):
         self.assertAlmostEqual(self.lattice.gamma, 60.0, self.places)
         detR0 = numalg.det(self.lattice.baserot)
         self.assertAlmostEqual(detR0, 1.0, self.places)
+        R0 = numalg.solve(self.lattice.stdbase, base)
+        self.assertTrue(numpy.allclose(R0, self.lattice.baserot, rtol=0, atol=1e-15))
         # try if rotation matrix works
         self.assertEqual(numpy.all(base == self.lattice.base), True)
         self.lattice.setLatPar(alpha=44, beta=66, gamma=88)
@@ -155,11 +176,76 @@ class TestLattice(unittest.TestCase):
         self.assertTrue(numpy.allclose(base[0], self.lattice.base[0]))
         self.assertTrue(numpy.allclose(base[1], self.lattice.base[1]))
         self.assertTrue(numpy.allclose(base[2], self.lattice.base[2]))
+        # integer base vectors are stored as floating point array
+        self.lattice.setLatBase([[2, 0, 0], [0, 2, 0], [0, 0, 2]])
+        self.assertEqual(float, self.lattice.base.dtype)
+        self.assertTrue(self.lattice.base.flags.c_contiguous)
+        self.assertTrue(numpy.array_equal([[0.5, 0.5, 0.5]], self.lattice.fractional([[1, 1, 1]])))
         # try base checking
         self.assertRaises(LatticeError, self.lattice.setLatBase, [[1, 0, 0], [1, 0, 0], [0, 0, 1]])
         self.assertRaises(LatticeError, self.lattice.setLatBase, [[1, 0, 0], [0, 0, 1], [0, 1, 0]])
         return
 
+    def test_unrotated_base(self):
+        """check base vectors for the default and explicit rotations."""
+        L1 = Lattice(1, 2, 3, 80, 100, 120)
+        self.assertTrue(numpy.array_equal(L1.stdbase, L1.base))
+        self.assertFalse(numpy.shares_memory(L1.stdbase, L1.base))
+        R = Lattice(base=[[1, 1, 0], [0, 1, 1], [1, 0, 1]]).baserot
+        L2 = Lattice(1, 2, 3, 80, 100, 120, baserot=R)
+        self.assertTrue(numpy.allclose(numpy.dot(L2.stdbase, R), L2.base))
+        L2.setLatPar(baserot=numpy.identity(3))
+        self.assertTrue(numpy.array_equal(L1.base, L2.base))
+        return
+
+    def test_no_negative_zeros(self):
+        """check there are no negative zeros in bases of a cubic cell."""
+        L = Lattice(2, 2, 2, 90, 90, 90)
+        for name in ("stdbase", "base", "recbase", "normbase", "recnormbase"):
+            m = getattr(L, name)
+            self.assertFalse(numpy.any(numpy.signbit(m)), name)
+        self.assertNotIn("-0.", repr(L.base))
+        self.assertNotIn("-0.", repr(L.recbase))
+        return
+
+    def test_recbase(self):
+        """check reciprocal base matrix is an inverse of the base."""
+        for latpar in [(1, 1, 1, 90, 90, 90), (1, 2, 3, 80, 100, 120), (3.1, 4.7, 2.2, 95, 63, 71)]:
+            L = Lattice(*latpar)
+            self.assertTrue(numpy.allclose(numalg.inv(L.base), L.recbase, rtol=0, atol=1e-15))
+            self.assertTrue(numpy.allclose(numpy.identity(3), numpy.dot(L.base, L.recbase)))
+            self.assertTrue(numpy.array_equal(numpy.triu(L.recbase), L.recbase))
+        # check rotated lattices
+        L1 = Lattice(base=[[1, 1, 0], [0, 1, 1], [1, 0, 1]])
+        L2 = Lattice(3.1, 4.7, 2.2, 95, 63, 71, baserot=L1.baserot)
+        for L in (L1, L2):
+            self.assertTrue(numpy.allclose(numalg.inv(L.base), L.recbase, rtol=0, atol=1e-15))
+        return
+
+    def test_normbase(self):
+        """check lazy evaluation of the normalized base matrices."""
+        L = Lattice(1, 2, 3, 80, 100, 120)
+        rabc = numpy.array([L.ar, L.br, L.cr])
+        self.assertTrue(numpy.allclose(L.base * rabc[:, None], L.normbase))
+        self.assertTrue(numpy.allclose(numalg.inv(L.normbase), L.recnormbase))
+        self.assertIs(L.normbase, L.normbase)
+        iu0 = L.isotropicunit
+        self.assertEqual(1.0, iu0[0, 0])
+        L.setLatPar(gamma=90)
+        self.assertTrue(numpy.allclose(numalg.inv(L.normbase), L.recnormbase))
+        self.assertFalse(numpy.array_equal(iu0, L.isotropicunit))
+        # assigned values are kept until the next update
+        L.normbase = nb = numpy.identity(3)
+        L.recnormbase = rnb = numpy.identity(3)
+        L.isotropicunit = iu = numpy.identity(3)
+        self.assertIs(nb, L.normbase)
+        self.assertIs(rnb, L.recnormbase)
+        self.assertIs(iu, L.isotropicunit)
+        L.setLatPar(gamma=120)
+        self.assertFalse(numpy.array_equal(nb, L.normbase))
+        self.assertTrue(numpy.allclose(numalg.inv(L.normbase), L.recnormbase))
+        return
+
     def test_reciprocal(self):
         """check calculation of reciprocal lattice."""
         r1 = self.lattice.reciprocal()
@@ -190,6 +276,8 @@ class TestLattice(unittest.TestCase):
         self.assertTrue(numpy.allclose([5, 3**0.5], self.lattice.norm(u)))
         self.lattice.setLatPar(gamma=120)
         self.assertAlmostEqual(1, self.lattice.norm([1, 1, 0]), self.places)
+        self.assertIsInstance(self.lattice.norm([1, 1, 0]), numpy.float64)
+        self.assertEqual((2,), self.lattice.norm([[1, 1, 0], [1, 0, 0]]).shape)
         return
 
     def test_rnorm(self):
@@ -217,6 +305,15 @@ class TestLattice(unittest.TestCase):
         self.assertTrue(numpy.allclose(5 * [d0], L.dist(u, v5)))
         self.assertTrue(numpy.allclose(5 * [d0], L.dist(u5, v)))
         self.assertTrue(numpy.allclose(5 * [d0], L.dist(v5, u5)))
+        out = numpy.zeros(5)
+        rv = L.dist(u5, v5, out=out)
+        self.assertIs(out, rv)
+        self.assertTrue(numpy.allclose(5 * [d0], out))
+        # matrix of all pair distances
+        uv = numpy.array([u, v])
+        dm = L.dist(uv[:, numpy.newaxis, :], uv)
+        self.assertEqual((2, 2), dm.shape)
+        self.assertTrue(numpy.allclose([[0, d0], [d0, 0]], dm))
         return
 
     def test_angle(self):
@@ -251,6 +348,30 @@ class TestLattice(unittest.TestCase):
         self.lattice.setLatBase(base)
         r = repr(self.lattice)
         self.assertEqual(r, "Lattice(base=%r)" % self.lattice.base)
+        # round-off deviations in baserot are ignored
+        R = numpy.identity(3) + 1e-12
+        L1 = Lattice(1, 2, 3, 10, 20, 30, baserot=R)
+        self.assertEqual(r0, repr(L1))
+        return
+
+    def test_baserot_assignment(self):
+        """check lattice with directly assigned baserot attribute"""
+        L = Lattice(2, 3, 4, 80, 90, 100)
+        R = numpy.array([[0.0, 1.0, 0.0], [-1.0, 0.0, 0.0], [0.0, 0.0, 1.0]])
+        L.baserot = R
+        L.setLatPar()
+        self.assertTrue(numpy.allclose(numpy.dot(L.stdbase, R), L.base))
+        self.assertTrue(numpy.allclose(numpy.identity(3), numpy.dot(L.base, L.recbase)))
+        self.assertEqual("Lattice(base=%r)" % L.base, repr(L))
+        # in-place modification is picked up as well
+        L.baserot[:] = numpy.identity(3)
+        L.setLatPar()
+        self.assertTrue(numpy.array_equal(L.stdbase, L.base))
+        self.assertEqual("Lattice(a=2, b=3, c=4, alpha=80, beta=90, gamma=100)", repr(L))
+        L.baserot[:] = R
+        L.setLatPar()
+        self.assertTrue(numpy.allclose(numpy.dot(L.stdbase, R), L.base))
+        return
 
 
 # End of class TestLattice
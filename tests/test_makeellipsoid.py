@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+##############################################################################
+#
+# diffpy.structure  by DANSE Diffraction group
+#                   Simon J. L. Billinge
+#                   (c) 2008 trustees of the Michigan State University.
+#                   All rights reserved.
+#
+# File coded by:    Pavol Juhas
+#
+# See AUTHORS.txt for a list of people who contributed.
+# See LICENSE_DANSE.txt for license information.
+#
+##############################################################################
+
+"""Unit tests for makeellipsoid.py
+"""
+
+import unittest
+
+import numpy
+import pytest
+
+from diffpy.structure import Lattice, Structure
+from diffpy.structure.expansion import supercell
+from diffpy.structure.expansion.makeellipsoid import makeEllipsoid, makeSphere
+from diffpy.structure.expansion.shapeutils import findCenter
+
+# ----------------------------------------------------------------------------
+
+
+class TestMakeEllipsoid(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def prepare_fixture(self, datafile):
+        self.datafile = datafile
+
+    def setUp(self):
+        self.stru_cdse = Structure(filename=self.datafile("CdSe_bulk.stru"))
+        return
+
+    def _keptIndices(self, S, a, b, c):
+        """Indices of supercell atoms kept by the per-atom criterion."""
+        frac = S.lattice.fractional([a, b, c])
+        mno = max(numpy.ceil(2 * frac).astype(int)) * numpy.array([1, 1, 1])
+        bigS = supercell(S, mno)
+        lat = bigS.lattice
+        cxyz = lat.cartesian(bigS[findCenter(bigS)].xyz)
+        rv = []
+        for i, atom in enumerate(bigS):
+            darray = ((lat.cartesian(atom.xyz) - cxyz) / [a, b, c]) ** 2
+            if not sum(darray) ** 0.5 > 1:
+                rv.append(i)
+        return bigS, rv
+
+    def test_makeEllipsoid(self):
+        """check atoms kept by makeEllipsoid for CdSe."""
+        for abc in [(8, 8, 8), (10, 6, 5)]:
+            bigS, kept = self._keptIndices(self.stru_cdse, *abc)
+            ell = makeEllipsoid(self.stru_cdse, *abc)
+            self.assertEqual(len(kept), len(ell))
+            self.assertTrue(numpy.array_equal(bigS.xyz[kept], ell.xyz))
+            self.assertEqual(list(bigS.element[kept]), list(ell.element))
+        return
+
+    def test_makeSphere_boundary(self):
+        """check atoms exactly on the sphere surface are kept."""
+        S = Structure(lattice=Lattice(1, 1, 1, 90, 90, 90))
+        S.addNewAtom("C", [0, 0, 0])
+        bigS, kept = self._keptIndices(S, 2, 2, 2)
+        sph = makeSphere(S, 2)
+        self.assertTrue(numpy.array_equal(bigS.xyz[kept], sph.xyz))
+        # distances from the center include the exact radius
+        cxyz = bigS.xyz_cartn[findCenter(bigS)]
+        d = numpy.sqrt(((sph.xyz_cartn - cxyz) ** 2).sum(axis=1))
+        self.assertEqual(2.0, d.max())
+        self.assertTrue(numpy.any(d == 2.0))
+        return
+
+
+# End of class TestMakeEllipsoid
+
+# ----------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
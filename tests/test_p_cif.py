@@ -56,6 +56,11 @@ class TestRoutines(unittest.TestCase):
         op1 = getSymOp("-x,-x+y,1/2+z")
         op1_std = SymOp(Rot_mX_mXY_Z, Tr_0_0_12)
         self.assertEqual(str(op1_std), str(op1))
+        op2 = getSymOp("-y+0.5,x-1/4+1/2,z")
+        self.assertEqual([0.5, 0.25, 0], op2.t.tolist())
+        op3 = getSymOp("x+1.0/2,y+1.5/3,z-2.5e-1")
+        self.assertEqual([0.5, 0.5, 0.75], op3.t.tolist())
+        self.assertRaises(ValueError, getSymOp, "x,y,z+__import__('os')")
         return
 
 
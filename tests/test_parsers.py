@@ -331,6 +331,27 @@ class TestP_xcfg(unittest.TestCase):
         f_Uii = [0.01303035, 0.01303035, 0.01401959]
         self.assertTrue(numpy.allclose(s_Uii, f_Uii))
 
+    def test_write_xcfg_orthorhombic(self):
+        """check XCFG cell matrix output for an orthorhombic cell"""
+        stru = self.stru
+        stru.lattice = Lattice(2, 3, 4, 90, 90, 90)
+        stru.addNewAtom("C", [0.1, 0.2, 0.3])
+        lines = stru.writeStr(self.format).splitlines()
+        hlines = [line for line in lines if line.startswith("H0(")]
+        f_hlines = [
+            "H0(1,1) = 2 A",
+            "H0(1,2) = 0 A",
+            "H0(1,3) = 0 A",
+            "H0(2,1) = 0 A",
+            "H0(2,2) = 3 A",
+            "H0(2,3) = 0 A",
+            "H0(3,1) = 0 A",
+            "H0(3,2) = 0 A",
+            "H0(3,3) = 4 A",
+        ]
+        self.assertEqual(f_hlines, hlines)
+        return
+
 
 # End of class TestP_xcfg
 
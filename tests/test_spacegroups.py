@@ -19,6 +19,8 @@
 
 import unittest
 
+import numpy
+
 from diffpy.structure.spacegroups import FindSpaceGroup, GetSpaceGroup, SpaceGroupList, _hashSymOpList
 
 # ----------------------------------------------------------------------------
@@ -87,6 +89,20 @@ class TestRoutines(unittest.TestCase):
         self.assertIs(sg123, FindSpaceGroup(ops123[::-1], shuffle=True))
         return
 
+    def test__get_symop_arrays(self):
+        "check cached rotation and translation arrays of a space group"
+        sg123 = GetSpaceGroup(123)
+        R, t = sg123._get_symop_arrays()
+        self.assertEqual((16, 3, 3), R.shape)
+        self.assertEqual((16, 3), t.shape)
+        for op, Ri, ti in zip(sg123.iter_symops(), R, t):
+            self.assertTrue(numpy.array_equal(op.R, Ri))
+            self.assertTrue(numpy.array_equal(op.t, ti))
+        self.assertIs(R, sg123._get_symop_arrays()[0])
+        sg123r = FindSpaceGroup(list(sg123.iter_symops())[::-1])
+        self.assertTrue(numpy.array_equal(R[::-1], sg123r._get_symop_arrays()[0]))
+        return
+
     def test__hashSymOpList(self):
         "verify _hashSymOpList is unique for each spacegroup"
         hset = set(_hashSymOpList(sg.symop_list) for sg in SpaceGroupList)
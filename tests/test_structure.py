@@ -105,6 +105,15 @@ class TestStructure(unittest.TestCase):
         self.assertFalse(cdse.lattice is cdse2.lattice)
         sameatoms = set(cdse).intersection(cdse2)
         self.assertFalse(sameatoms)
+        # check pdffit metadata are copied in full depth
+        cdse.pdffit = {"scale": 0.5, "spcgr": "P1", "ncell": [1, 1, 1, 4]}
+        cdse3 = copy.copy(cdse)
+        self.assertEqual(cdse.pdffit, cdse3.pdffit)
+        self.assertFalse(cdse.pdffit["ncell"] is cdse3.pdffit["ncell"])
+        cdse.pdffit["extra"] = {"dcell": [0.1]}
+        cdse4 = copy.copy(cdse)
+        self.assertEqual(cdse.pdffit, cdse4.pdffit)
+        self.assertFalse(cdse.pdffit["extra"]["dcell"] is cdse4.pdffit["extra"]["dcell"])
         return
 
     # def test___str__(self):
@@ -125,6 +134,11 @@ class TestStructure(unittest.TestCase):
         self.stru.assignUniqueLabels()
         self.assertEqual("C1", self.stru[0].label)
         self.assertEqual("C2", self.stru[1].label)
+        # ions and isotopes share the count of their bare element
+        stru = Structure([Atom("Na+"), Atom("Cl-"), Atom("Na"), Atom("35-Cl")])
+        stru.append(stru[0], copy=False)
+        stru.assignUniqueLabels()
+        self.assertEqual(["Na1", "Cl1", "Na2", "Cl2", "Na1"], stru.label.tolist())
         return
 
     def test_distance(self):
@@ -137,6 +151,43 @@ class TestStructure(unittest.TestCase):
         self.assertAlmostEqual(sqrt(2.0), self.stru.distance(0, 1), self.places)
         self.assertAlmostEqual(sqrt(2.0), self.stru.distance("C1", "C2"), self.places)
         self.assertEqual(0, self.stru.distance(0, "C1"))
+        self.assertAlmostEqual(sqrt(2.0), self.stru.distance(numpy.int64(-1), 0), self.places)
+        self.stru[1].label = "C1"
+        self.assertRaises(IndexError, self.stru.distance, 0, "C1")
+        return
+
+    def test_distances(self):
+        """check Structure.distances()"""
+        cdse = Structure(filename=self.cdsefile)
+        cdse.assignUniqueLabels()
+        dmx = cdse.distances()
+        self.assertEqual((4, 4), dmx.shape)
+        for i in range(4):
+            for j in range(4):
+                self.assertAlmostEqual(cdse.distance(i, j), dmx[i, j], self.places)
+        self.assertTrue(numpy.array_equal(dmx[:1, 2:], cdse.distances(["Cd1"], cdse.element == "Se")))
+        self.assertTrue(numpy.array_equal(dmx[1:3, ::2], cdse.distances(slice(1, 3), (0, "Se1"))))
+        self.assertEqual((0, 4), cdse.distances([], slice(None)).shape)
+        # single index or label
+        self.assertTrue(numpy.array_equal(dmx[:1], cdse.distances("Cd1", slice(None))))
+        self.assertTrue(numpy.array_equal(dmx[2:3, 1:2], cdse.distances(numpy.int64(2), "Cd2")))
+        self.assertEqual((1, 1), cdse.distances("Se2").shape)
+        self.assertTrue(numpy.array_equal(numpy.zeros(4), dmx.diagonal()))
+        self.assertTrue(numpy.array_equal(dmx, dmx.T))
+        self.assertEqual((0, 0), Structure().distances().shape)
+        self.assertRaises(IndexError, cdse.distances, ["Cd9"])
+        self.assertRaises(IndexError, cdse.distances, "Cd9")
+        self.assertRaises(IndexError, cdse.distances, [0], [7])
+        # periodic boundary conditions
+        pmx = cdse.distances(pbc=True)
+        self.assertTrue(numpy.array_equal(numpy.zeros(4), pmx.diagonal()))
+        self.assertTrue(numpy.all(pmx <= dmx + 1e-12))
+        stru = Structure(lattice=Lattice(4, 5, 6, 90, 90, 90))
+        stru.addNewAtom("C", [0.05, 0.1, 0.5])
+        stru.addNewAtom("O", [0.95, 0.8, 0.5])
+        self.assertAlmostEqual(numpy.hypot(3.6, 3.5), stru.distances()[0, 1], self.places)
+        self.assertAlmostEqual(numpy.hypot(0.4, 1.5), stru.distances(pbc=True)[0, 1], self.places)
+        self.assertEqual((0, 2), stru.distances([], slice(None), pbc=True).shape)
         return
 
     def test_angle(self):
@@ -145,6 +196,24 @@ class TestStructure(unittest.TestCase):
         cdse.assignUniqueLabels()
         self.assertEqual(109, round(cdse.angle(0, 2, 1)))
         self.assertEqual(109, round(cdse.angle("Cd1", "Se1", "Cd2")))
+        self.assertRaises(IndexError, cdse.angle, 0, 2, "Cd9")
+        return
+
+    def test_angles(self):
+        """check Structure.angles()"""
+        cdse = Structure(filename=self.cdsefile)
+        cdse.assignUniqueLabels()
+        triplets = [(0, 2, 1), (2, 0, 3), (3, 1, 0)]
+        a3 = cdse.angles(triplets)
+        self.assertEqual((3,), a3.shape)
+        for a, t in zip(a3, triplets):
+            self.assertAlmostEqual(cdse.angle(*t), a, self.places)
+        self.assertTrue(numpy.array_equal(a3, cdse.angles(numpy.array(triplets))))
+        self.assertTrue(numpy.array_equal(a3[:1], cdse.angles([("Cd1", "Se1", 1)])))
+        self.assertEqual((0,), cdse.angles([]).shape)
+        self.assertRaises(IndexError, cdse.angles, [(0, 2, "Cd9")])
+        self.assertRaises(IndexError, cdse.angles, [(0, 2, 7)])
+        self.assertRaises(ValueError, cdse.angles, [(0, 2)])
         return
 
     def test_placeInLattice(self):
@@ -157,13 +226,53 @@ class TestStructure(unittest.TestCase):
         a1 = stru[1]
         self.assertTrue(numpy.allclose(a1.xyz, [2.0, 0.0, 2.0]))
 
+        # anisotropic displacements keep their Cartesian form
+        def ucart(a):
+            nb = a.lattice.normbase
+            return numpy.dot(nb.T, numpy.dot(a.U, nb))
+
+        stru2 = Structure(lattice=Lattice(1, 2, 3, 80, 90, 100))
+        U0 = numpy.array([[0.01, 0.002, 0.0], [0.002, 0.02, 0.001], [0.0, 0.001, 0.03]])
+        stru2.addNewAtom("C", [0.1, 0.2, 0.3], U=U0)
+        stru2.addNewAtom("O", [0.4, 0.5, 0.6], Uisoequiv=0.02)
+        xyzc0 = stru2.xyz_cartn
+        Uc0 = ucart(stru2[0])
+        stru2.placeInLattice(Lattice(2, 3, 4, 70, 95, 120))
+        self.assertTrue(numpy.allclose(xyzc0, stru2.xyz_cartn))
+        self.assertTrue(numpy.allclose(Uc0, ucart(stru2[0])))
+        self.assertEqual(0.02, stru2[1].Uisoequiv)
+        # empty structure only changes its lattice
+        stru3 = Structure()
+        stru3.placeInLattice(new_lattice)
+        self.assertIs(new_lattice, stru3.lattice)
+        return
+
     # def test_read(self):
     #     """check Structure.read()"""
     #     return
 
-    # def test_readStr(self):
-    #     """check Structure.readStr()"""
-    #     return
+    def test_readStr(self):
+        """check Structure.readStr()"""
+        stru = Structure(title="old")
+        stru.addNewAtom("C", [0, 0, 0])
+        stru.addNewAtom("O", [0.5, 0.5, 0.5])
+        s = self.stru.writeStr("xyz")
+        stru.readStr(s, "xyz")
+        self.assertEqual(len(self.stru), len(stru))
+        self.assertEqual(list(self.stru.element), list(stru.element))
+        self.assertEqual("", stru.title)
+        self.assertTrue(all(a.lattice is stru.lattice for a in stru))
+        self.assertTrue(numpy.allclose(self.stru.xyz_cartn, stru.xyz_cartn))
+        # atoms are independent of those kept by the parser
+        with open(self.pbtefile) as fp:
+            p = stru.readStr(fp.read(), "cif")
+        self.assertEqual(len(p.stru), len(stru))
+        self.assertFalse(any(a in stru for a in p.stru))
+        self.assertFalse(any(a in stru for a in p.asymmetric_unit))
+        x0 = p.stru[0].xyz[0]
+        stru[0].xyz[0] += 0.1
+        self.assertEqual(x0, p.stru[0].xyz[0])
+        return
 
     # def test_write(self):
     #     """check Structure.write()"""
@@ -191,6 +300,7 @@ class TestStructure(unittest.TestCase):
         self.assertTrue(lat is alast.lattice)
         self.assertTrue(numpy.array_equal(a.xyz, alast.xyz))
         self.assertFalse(a is alast)
+        self.assertFalse(numpy.shares_memory(a.xyz, alast.xyz))
         self.assertFalse(lat is a.lattice)
         return
 
@@ -205,6 +315,7 @@ class TestStructure(unittest.TestCase):
         self.assertTrue(lat is a1.lattice)
         self.assertTrue(numpy.array_equal(a.xyz, a1.xyz))
         self.assertFalse(a is a1)
+        self.assertFalse(numpy.shares_memory(a.xyz, a1.xyz))
         self.assertFalse(lat is a.lattice)
         return
 
@@ -218,6 +329,9 @@ class TestStructure(unittest.TestCase):
         self.assertTrue(all(a.lattice is stru.lattice for a in stru))
         self.assertEqual(lst, stru.tolist()[:2])
         self.assertFalse(stru[-1] is cdse[-1])
+        self.assertFalse(numpy.shares_memory(stru[-1].xyz, cdse[-1].xyz))
+        self.assertFalse(numpy.shares_memory(stru[-1].U, cdse[-1].U))
+        self.assertTrue(numpy.array_equal(stru.xyz[2:], cdse.xyz))
         return
 
     def test___getitem__(self):
@@ -245,6 +359,17 @@ class TestStructure(unittest.TestCase):
         self.assertTrue(stru[1] is stru["B"])
         stru[1].label = "A"
         self.assertRaises(IndexError, stru.__getitem__, "A")
+        # label lookup follows changes in the order of atoms
+        cdse.reverse()
+        self.assertTrue(cdse[-1] is cdse["Hohenzollern"])
+        del cdse[-1]
+        self.assertRaises(IndexError, cdse.__getitem__, "Hohenzollern")
+        cdse1 = pickle.loads(pickle.dumps(cdse))
+        self.assertEqual(cdse.label.tolist(), [a.label for a in cdse1["Se2", "Se1", "Cd2"]])
+        # numpy scalar labels and indices
+        self.assertTrue(cdse1[1] is cdse1[cdse1.label[1]])
+        self.assertTrue(cdse1[1] is cdse1[numpy.int64(1)])
+        self.assertEqual([cdse1[2], cdse1[0]], cdse1[numpy.int32(2), numpy.str_("Se2")].tolist())
         return
 
     def test___getitem__slice(self):
@@ -252,6 +377,9 @@ class TestStructure(unittest.TestCase):
         stru = self.stru
         self.assertEqual([stru[0]], stru[:1].tolist())
         self.assertEqual([stru[1], stru[0]], stru[::-1].tolist())
+        # substructures share the lattice of the parent
+        self.assertIs(stru.lattice, stru[:1].lattice)
+        self.assertIs(stru.lattice, stru[[1]].lattice)
         return
 
     def test___setitem__(self):
@@ -265,6 +393,7 @@ class TestStructure(unittest.TestCase):
         self.assertTrue(lat is a1.lattice)
         self.assertTrue(numpy.array_equal(a.xyz, a1.xyz))
         self.assertFalse(a is a1)
+        self.assertFalse(numpy.shares_memory(a.xyz, a1.xyz))
         self.assertFalse(lat is a.lattice)
         return
 
@@ -280,6 +409,13 @@ class TestStructure(unittest.TestCase):
         self.assertTrue(numpy.array_equal(a.xyz, a0.xyz))
         self.assertFalse(a is a0)
         self.assertFalse(lat is a.lattice)
+        self.assertFalse(numpy.shares_memory(a.xyz, a0.xyz))
+        # atoms already in the slice are kept without copying
+        b = Atom("O", (0.4, 0.5, 0.6))
+        self.stru[:] = [b, a0]
+        self.assertTrue(a0 is self.stru[1])
+        self.assertFalse(b is self.stru[0])
+        self.assertTrue(lat is self.stru[0].lattice)
         return
 
     def test___add__(self):
@@ -326,6 +462,7 @@ class TestStructure(unittest.TestCase):
         self.assertTrue(numpy.array_equal(cdse[1].xyz, cadmiums[1].xyz))
         self.assertFalse(cdse[0] is cadmiums[0])
         self.assertFalse(cdse.lattice is cadmiums.lattice)
+        self.assertTrue(all(a.lattice is cadmiums.lattice for a in cadmiums))
         return
 
     def test___isub__(self):
@@ -407,6 +544,9 @@ class TestStructure(unittest.TestCase):
         self.assertEqual(cdse[:2], cdse[cdse.element == "Cd"])
         stru.element = stru.element.replace("C", "Si")
         self.assertEqual("Si", stru[0].element)
+        self.assertTrue(isinstance(cdse.element, numpy.char.chararray))
+        self.assertEqual(numpy.dtype("U5"), cdse.element.dtype)
+        self.assertEqual(numpy.dtype("U5"), Structure().element.dtype)
         return
 
     def test_xyz(self):
@@ -488,6 +628,17 @@ class TestStructure(unittest.TestCase):
         pbte.xyz_cartn += numpy.array([0.1, 0.2, 0.3]) * 6.461
         self.assertTrue(numpy.allclose([0.6, 0.7, 0.8], pbte[0].xyz))
         self.assertTrue(numpy.allclose([0.6, 0.7, 0.3], pbte[7].xyz))
+        # atoms with a foreign lattice use their own transformation
+        a7 = pbte[7]
+        a7.lattice = Lattice(1, 1, 1, 90, 90, 90)
+        xyzc = pbte.xyz_cartn
+        self.assertTrue(numpy.allclose(a7.xyz, xyzc[7]))
+        self.assertTrue(numpy.allclose(pbte[0].xyz_cartn, xyzc[0]))
+        pbte.xyz_cartn = xyzc + 1
+        self.assertTrue(numpy.allclose([1.6, 1.7, 1.3], a7.xyz))
+        self.assertTrue(numpy.allclose(xyzc[0] + 1, pbte[0].xyz_cartn))
+        # empty structure
+        self.assertEqual(0, len(Structure().xyz_cartn))
         return
 
     def test_anisotropy(self):
@@ -540,6 +691,16 @@ class TestStructure(unittest.TestCase):
         u11old = tei[0].U11
         tei.Uisoequiv = 0.001
         self.assertAlmostEqual(u11old * 0.001 / 0.019227, tei[0].U[0, 0])
+        # check mixed anisotropic and isotropic atoms
+        tei = copy.copy(self.tei)
+        tei[1].anisotropy = False
+        tei[2].lattice = Lattice()
+        uiso = [a.Uisoequiv for a in tei]
+        self.assertTrue(numpy.allclose(uiso, tei.Uisoequiv, rtol=1e-14, atol=0))
+        del tei[2]
+        uiso = [a.Uisoequiv for a in tei]
+        self.assertTrue(numpy.allclose(uiso, tei.Uisoequiv, rtol=1e-14, atol=0))
+        self.assertEqual((0,), Structure().Uisoequiv.shape)
         return
 
     def test_Uij(self):
@@ -555,6 +716,17 @@ class TestStructure(unittest.TestCase):
         self.assertTrue(numpy.array_equal([0, 0.23], stru.U23))
         stru.U11 = stru.U22 = stru.U33 = stru.U12 = stru.U13 = stru.U23 = 0.0
         self.assertFalse(numpy.any(stru.U != 0.0))
+        # check mixed anisotropic and isotropic atoms in oblique lattice
+        tei = copy.copy(self.tei)
+        tei.lattice.setLatPar(alpha=80, gamma=110)
+        tei[1].anisotropy = False
+        tei[3].anisotropy = False
+        for n in ("U11", "U22", "U33", "U12", "U13", "U23", "B11", "B23"):
+            uij = [getattr(a, n) for a in tei]
+            self.assertTrue(numpy.array_equal(uij, getattr(tei, n)), n)
+        tei[2].lattice = Lattice()
+        self.assertTrue(numpy.array_equal([a.U12 for a in tei], tei.U12))
+        self.assertEqual((0,), Structure().U12.shape)
         return
 
     def test_Bisoequiv(self):
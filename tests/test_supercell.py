@@ -71,6 +71,10 @@ class TestSuperCell(unittest.TestCase):
         self.assertAlmostEqual(x / 1, x1, 8)
         self.assertAlmostEqual(y / 2, y2, 8)
         self.assertAlmostEqual(z / 3, z3, 8)
+        # expanded atoms are independent of the source structure
+        self.assertEqual(len(ni_123), len(set(map(id, ni_123))))
+        self.assertFalse(any(a in ni_123 for a in self.stru_ni))
+        self.assertTrue(all(a.lattice is ni_123.lattice for a in ni_123))
         return
 
     def test_cdse_supercell(self):
@@ -82,6 +86,13 @@ class TestSuperCell(unittest.TestCase):
         self.assertEqual(elems, elems_222)
         return
 
+    def test_empty_supercell(self):
+        """check supercell expansion of an empty structure."""
+        empty_213 = supercell(Structure(), (2, 1, 3))
+        self.assertEqual(0, len(empty_213))
+        self.assertEqual((2, 1, 3), empty_213.lattice.abcABG()[:3])
+        return
+
 
 # End of class TestRoutines
 
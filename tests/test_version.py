@@ -7,4 +7,5 @@ import diffpy.structure
 def test_package_version():
     """Ensure the package version is defined and not set to the initial placeholder."""
     assert hasattr(diffpy.structure, "__version__")
+    assert "__version__" in dir(diffpy.structure)
     assert diffpy.structure.__version__ != "0.0.0"